@@ -26,6 +26,7 @@ Configuration:
 
 import asyncio
 import logging
+import operator
 import time
 from collections import namedtuple
 
@@ -36,15 +37,54 @@ from weeutil.weeutil import to_bool, to_int
 
 VERSION = '0.3.0'
 
+# The notification data passed to the notifier.
+# Build the classes once, namedtuple() is expensive compared to creating an instance.
+OutsideResult = namedtuple('OutsideResult', ['threshold_type', 'threshold_value', 'weewx_name', 'label', 'current_value',
+                                             'type', 'notifications_sent', 'date_time', 'first_check'])
+WithinResult = namedtuple('WithinResult', ['threshold_type', 'threshold_value', 'weewx_name', 'label', 'current_value',
+                                           'type', 'notifications_sent', 'date_time'])
+
+# The comparison that is True when an observation is within the threshold.
+WITHIN_THRESHOLD = {
+    'min': operator.ge,
+    'max': operator.le,
+    'equal': operator.eq,
+}
+
+# The message templates, keyed by the threshold type and whether the value is outside or within the threshold.
+MSG_TEMPLATE = {
+    ('equal', 'outside'): ("At {date_time} {label} ({name}) is no longer equal to threshold of {threshold_value}. "
+                           "Current value is {current_value}. {notifications_sent} sent.\n"),
+    ('equal', 'within'): ("{label} ({name}) Not Equal at {date_time} is within threshold with value {current_value}, "
+                          "{notifications_sent} notifications sent.\n"),
+    ('max', 'outside'): ("At {date_time} {label} ({name}) went above threshold of {threshold_value}. "
+                         "Current value is {current_value}. {notifications_sent} sent.\n"),
+    ('max', 'within'): ("{label} ({name}) over Max threshold at {date_time} is within threshold with value {current_value}, "
+                        "{notifications_sent} notifications sent.\n"),
+    ('min', 'outside'): ("At {date_time} {label} ({name}) went below threshold of {threshold_value}. "
+                         "Current value is {current_value}. {notifications_sent} sent.\n"),
+    ('min', 'within'): ("{label} ({name}) under Min threshold at {date_time} is within threshold with value {current_value}, "
+                        "{notifications_sent} notifications sent.\n"),
+    ('missing', 'outside'): "{label} ({name}) missing at {date_time}, {notifications_sent} notifications sent.\n",
+    ('missing', 'within'): ("{label} ({name}) missing at {date_time} returned with value {current_value}, "
+                            "{notifications_sent} notification sent.\n"),
+}
+# The bound format_map of each template, looked up once per message.
+MSG_FORMATTER = {key: template.format_map for key, template in MSG_TEMPLATE.items()}
+
 def format_timestamp(ts, format_str="%Y-%m-%d %H:%M:%S %Z"):
     ''' Format a timestamp for human consumption. '''
-    return f"{time.strftime(format_str, time.localtime(ts))}"
+    return time.strftime(format_str, time.localtime(ts))
 
 class Logger:
     ''' Manage the logging '''
     def __init__(self):
         self.log = logging.getLogger(__name__)
 
+    def is_debug_enabled(self):
+        """ Check if debug messages will be logged. """
+        return self.log.isEnabledFor(logging.DEBUG)
+
     def logdbg(self, caller, msg):
         """ log debug messages """
         self.log.debug("(%s) %s", caller, msg)
@@ -65,6 +105,9 @@ class Notify(StdService):
         self.name = self.__class__.__name__
 
         self.logger = Logger()
+        # The event loop is created on first use and reused for every record/packet.
+        self.loop = None
+        self.notifier = None
 
         service_dict = config_dict.get('Notify', {})
 
@@ -139,44 +182,41 @@ class Notify(StdService):
                 observation[value_type]['last_sent_timestamp'] = 0
                 observation[value_type]['counter'] = 0
 
+        # Precompute the configured threshold types, in the order they are checked.
+        observation['threshold_types'] = [value_type for value_type in ['missing', 'min', 'max', 'equal']
+                                          if value_type in observation]
+
         return observation
 
-    def check_outside(self, first_check, notification_type, name, label, observation_detail, value):
+    def check_outside(self, first_check, notification_type, name, label, observation_detail, value, now):
         ''' Check if an observation is less than a desired value.
             Send a notification if time and cound thresholds have been met. '''
         result = None
-        now = int(time.time())
-        result2 = {
-            'threshold_type': notification_type,
-            'threshold_value': observation_detail['value'],
-            'weewx_name': name,
-            'label': label,
-            'current_value': value,
-        }
-        self.logger.logdbg(self.name, f"  {notification_type} check {value} to {observation_detail['value']} for {name}{label}")
-        time_delta = abs(now - observation_detail['last_sent_timestamp'])
-        self.logger.logdbg(self.name, (f"    Time delta {notification_type} is {time_delta} and "
-                                       f"threshold is {observation_detail['wait_time']} for {name}{label}"))
-        self.logger.logdbg(self.name, (f"    Running count {notification_type} is {observation_detail['counter']} "
-                                       f"and threshold is {observation_detail['count']} for {name}{label}"))
+        time_delta = now - observation_detail['last_sent_timestamp']
+        if self.logger.is_debug_enabled():
+            self.logger.logdbg(self.name, f"  {notification_type} check {value} to {observation_detail['value']} for {name}{label}")
+            self.logger.logdbg(self.name, (f"    Time delta {notification_type} is {time_delta} and "
+                                           f"threshold is {observation_detail['wait_time']} for {name}{label}"))
+            self.logger.logdbg(self.name, (f"    Running count {notification_type} is {observation_detail['counter']} "
+                                           f"and threshold is {observation_detail['count']} for {name}{label}"))
 
         if observation_detail['counter'] == 0:
-            observation_detail['threshold_passed'] = {}
-            observation_detail['threshold_passed']['timestamp'] = now
-            observation_detail['threshold_passed']['notification_count'] = 0
+            observation_detail['threshold_passed'] = {'timestamp': now, 'notification_count': 0}
 
         observation_detail['counter'] += 1
         if time_delta >= observation_detail['wait_time']:
             if observation_detail['counter'] >= observation_detail['count'] or first_check:
-                observation_detail['threshold_passed']['notification_count'] += 1
-                result2['type'] = 'outside'
-                result2['notifications_sent'] = observation_detail['threshold_passed']['notification_count']
-                result2['date_time'] = observation_detail['threshold_passed']['timestamp']
-                result2['first_check'] = first_check
-                result = result2
-
-        if result:
-            return namedtuple('Result', result.keys())(**result)
+                threshold_passed = observation_detail['threshold_passed']
+                threshold_passed['notification_count'] += 1
+                result = OutsideResult(threshold_type=notification_type,
+                                       threshold_value=observation_detail['value'],
+                                       weewx_name=name,
+                                       label=label,
+                                       current_value=value,
+                                       type='outside',
+                                       notifications_sent=threshold_passed['notification_count'],
+                                       date_time=threshold_passed['timestamp'],
+                                       first_check=first_check)
 
         return result
 
@@ -184,25 +224,23 @@ class Notify(StdService):
         ''' Check if an observation is not equal to desired value.
             Send a notification if time and cound thresholds have been met. '''
         result = None
-        result2 = {
-            'threshold_type': notification_type,
-            'threshold_value': observation_detail['value'],
-            'weewx_name': name,
-            'label': label,
-            'current_value': value,
-        }
-        self.logger.logdbg(self.name, f"  {notification_type} check {value} to {observation_detail['value']} for {name}{label}")
-        self.logger.logdbg(self.name, (f"    Running count {notification_type} is {observation_detail['counter']} and "
-                                       f"threshold is {observation_detail['count']} for {name}{label}"))
+        if self.logger.is_debug_enabled():
+            self.logger.logdbg(self.name, f"  {notification_type} check {value} to {observation_detail['value']} for {name}{label}")
+            self.logger.logdbg(self.name, (f"    Running count {notification_type} is {observation_detail['counter']} and "
+                                           f"threshold is {observation_detail['count']} for {name}{label}"))
 
         if observation_detail['counter'] > 0:
             if observation_detail['threshold_passed']['notification_count'] > 0:
                 if observation_detail['return_notification']:
-                    result2['type'] = 'within'
-                    result2['notifications_sent'] = observation_detail['threshold_passed']['notification_count']
-                    result2['date_time'] = observation_detail['threshold_passed']['timestamp']
-                    result = result2
-                else:
+                    result = WithinResult(threshold_type=notification_type,
+                                          threshold_value=observation_detail['value'],
+                                          weewx_name=name,
+                                          label=label,
+                                          current_value=value,
+                                          type='within',
+                                          notifications_sent=observation_detail['threshold_passed']['notification_count'],
+                                          date_time=observation_detail['threshold_passed']['timestamp'])
+                elif self.logger.is_debug_enabled():
                     self.logger.logdbg(self.name, (f"    Notification not requested for {name}{label} "
                                                    f"being outside {notification_type} at "
                                                    f"{format_timestamp(observation_detail['threshold_passed']['timestamp'])} "
@@ -214,93 +252,124 @@ class Notify(StdService):
 
             observation_detail['counter'] = 0
 
-        if result:
-            return namedtuple('Result', result.keys())(**result)
-
         return result
 
     async def _process_data(self, first_check, data, observations):
         # log.debug("Processing record: %s", data)
-        now = time.time()
-        tasks = []
-        task_names = {}
-        await self.notifier.initialize()
+        now = int(time.time())
+        notifications = []
 
         for _obs, observation_detail in observations.items():
             observation = observation_detail['weewx_name']
-
-            if observation in data and data[observation] is not None:
-                self.logger.logdbg(self.name, f"Processing observation: {observation}{observation_detail['label']}")
-                detail_types = ['missing', 'min', 'max', 'equal']
-                for detail_type in detail_types:
-                    if observation_detail.get(detail_type, None):
-                        if (detail_type == 'missing') or \
-                           (detail_type == 'min' and data[observation] >= observation_detail[detail_type]['value']) or \
-                           (detail_type == 'max' and data[observation] <= observation_detail[detail_type]['value']) or \
-                           (detail_type == 'equal' and data[observation] == observation_detail[detail_type]['value']):
-                            result = self.check_within(detail_type,
-                                                       observation_detail['weewx_name'],
-                                                       observation_detail['label'],
-                                                       observation_detail[detail_type],
-                                                       data[observation])
-                        else:
-                            result = self.check_outside(first_check,
-                                                        detail_type,
-                                                        observation_detail['weewx_name'],
-                                                        observation_detail['label'],
-                                                        observation_detail[detail_type],
-                                                        data[observation])
-
-                        if result:
-                            task_name = f"{observation}-{detail_type}-{now}"
-                            # If missing has returned, do reset sent timestamp
-                            if detail_type != 'missing':
-                                task_names[task_name] = observation_detail[detail_type]
-                            self.logger.logdbg(self.name, f"Task, {task_name}, with {result}, has been submitted and recorded.")
-                            tasks.append(asyncio.create_task(self.notifier.send_notification(result), name=task_name))
-
-            detail_type = 'missing'
-            if observation not in data and observation_detail.get(detail_type, None):
+            value = data.get(observation)
+
+            if value is not None:
+                if self.logger.is_debug_enabled():
+                    self.logger.logdbg(self.name, f"Processing observation: {observation}{observation_detail['label']}")
+                for detail_type in observation_detail['threshold_types']:
+                    if detail_type == 'missing' or \
+                       WITHIN_THRESHOLD[detail_type](value, observation_detail[detail_type]['value']):
+                        result = self.check_within(detail_type,
+                                                   observation_detail['weewx_name'],
+                                                   observation_detail['label'],
+                                                   observation_detail[detail_type],
+                                                   value)
+                    else:
+                        result = self.check_outside(first_check,
+                                                    detail_type,
+                                                    observation_detail['weewx_name'],
+                                                    observation_detail['label'],
+                                                    observation_detail[detail_type],
+                                                    value,
+                                                    now)
+
+                    if result:
+                        # If missing has returned, do reset sent timestamp
+                        notifications.append((f"{observation}-{detail_type}-{now}",
+                                              result,
+                                              observation_detail[detail_type] if detail_type != 'missing' else None))
+
+            elif observation not in data and 'missing' in observation_detail:
+                detail_type = 'missing'
                 result = self.check_outside(first_check,
                                             detail_type,
                                             observation_detail['weewx_name'],
                                             observation_detail['label'],
                                             observation_detail['missing'],
-                                            None)
+                                            None,
+                                            now)
                 if result:
-                    task_name = f"{observation}-{detail_type}-{now}"
-                    task_names[task_name] = observation_detail[detail_type]
-                    self.logger.logdbg(self.name, f"Task, {task_name}, with {result}, has been submitted and recorded.")
-                    tasks.append(asyncio.create_task(self.notifier.send_notification(result), name=task_name))
-
-        if tasks:
-            done, pending = await asyncio.wait(tasks, return_when=asyncio.ALL_COMPLETED, timeout=self.notifier.timeout)
-            for task in done:
-                result = task.result()
-                task_name = task.get_name()
-                self.logger.logdbg(self.name, f"Task, {task_name}, completed with result, {result}.")
-                if task_name in task_names and result:
-                    task_names[task_name]['last_sent_timestamp'] = now
+                    notifications.append((f"{observation}-{detail_type}-{now}", result, observation_detail[detail_type]))
 
-            for task in pending:
-                task_name = task.get_name()
-                cancelled = task.cancel()
-                self.logger.logerr(self.name, f"Task, {task_name}, cancellation attempt with result {cancelled}.")
+        # Most records do not pass a threshold, only set up the notifier when there is something to send.
+        if not notifications:
+            return
+
+        await self.notifier.initialize()
+
+        # The threshold detail to update when the task's notification is sent, keyed by the task.
+        tasks = {}
+        for task_name, result, threshold_detail in notifications:
+            task = asyncio.create_task(self.notifier.send_notification(result), name=task_name)
+            tasks[task] = threshold_detail
+            if self.logger.is_debug_enabled():
+                self.logger.logdbg(self.name, f"Task, {task.get_name()}, with {result}, has been submitted and recorded.")
+
+        done, pending = await asyncio.wait(tasks.keys(), return_when=asyncio.ALL_COMPLETED, timeout=self.notifier.timeout)
+        for task in done:
+            try:
+                result = task.result()
+            except Exception as exception:  # pylint: disable=broad-exception-caught
+                # A failing notifier must not take down the WeeWX engine.
+                self.logger.logerr(self.name, f"Task, {task.get_name()}, failed with {exception!r}.")
+                continue
+            if self.logger.is_debug_enabled():
+                self.logger.logdbg(self.name, f"Task, {task.get_name()}, completed with result, {result}.")
+            threshold_detail = tasks.get(task)
+            if threshold_detail and result:
+                threshold_detail['last_sent_timestamp'] = now
+
+        for task in pending:
+            cancelled = task.cancel()
+            self.logger.logerr(self.name, f"Task, {task.get_name()}, cancellation attempt with result {cancelled}.")
 
         await self.notifier.finalize()
 
+    def _run(self, coroutine):
+        ''' Run the coroutine to completion on the long-lived event loop. '''
+        if self.loop is None:
+            self.loop = asyncio.new_event_loop()
+        self.loop.run_until_complete(coroutine)
+
     def new_archive_record(self, event):
         """ Handle the new archive record event. """
-        if not self.notifier.throttle_notification():
-            asyncio.run(self._process_data(self.archive_first_check, event.record, self.archive_observations))
+        self._check_data(self.archive_first_check, event.record, self.archive_observations)
         self.archive_first_check = False
 
     def new_loop_packet(self, event):
         """ Handle the new loop packet event. """
-        if not self.notifier.throttle_notification():
-            asyncio.run(self._process_data(self.loop_first_check, event.packet, self.loop_observations))
+        self._check_data(self.loop_first_check, event.packet, self.loop_observations)
         self.loop_first_check = False
 
+    def _check_data(self, first_check, data, observations):
+        ''' Process the record/packet unless the notifier is backing off. '''
+        if not self.notifier.throttle_notification():
+            self._run(self._process_data(first_check, data, observations))
+
+    def shutDown(self):
+        """ Cancel any outstanding notifications, close the event loop and the notifier. """
+        if self.loop:
+            pending = asyncio.all_tasks(self.loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
+            self.loop = None
+        if self.notifier:
+            self.notifier.close()
+
 class AbstractNotifier():
     ''' Abstract class for sending notifications.'''
     def __init__(self, logger, config_dict):
@@ -327,53 +396,16 @@ class AbstractNotifier():
 
     def build_message(self, msg_data):
         """ Build a message based on threshold status."""
-        msg_template = {
-            'equal': {
-                'outside': ("At {date_time} {label} ({name}) is no longer equal to threshold of {threshold_value}. "
-                            "Current value is {current_value}. {notifications_sent} sent.\n"),
-                'within': ("{label} ({name}) Not Equal at {date_time} is within threshold with value {current_value}, "
-                           "{notifications_sent} notifications sent.\n"),
-            },
-            'max': {
-                'outside': ("At {date_time} {label} ({name}) went above threshold of {threshold_value}. "
-                            "Current value is {current_value}. {notifications_sent} sent.\n"),
-                'within': ("{label} ({name}) over Max threshold at {date_time} is within threshold with value {current_value}, "
-                           "{notifications_sent} notifications sent.\n"),
-            },
-            'min': {
-                'outside': ("At {date_time} {label} ({name}) went below threshold of {threshold_value}. "
-                            "Current value is {current_value}. {notifications_sent} sent.\n"),
-                'within': ("{label} ({name}) under Min threshold at {date_time} is within threshold with value {current_value}, "
-                           "{notifications_sent} notifications sent.\n"),
-            },
-        }
-
-        msg_missing_template = {
-            'outside': "{label} ({name}) missing at {date_time}, {notifications_sent} notifications sent.\n",
-            'within': ("{label} ({name}) missing at {date_time} returned with value {current_value}, "
-                       "{notifications_sent} notification sent.\n"),
+        # Placeholders that a template does not use are ignored by format_map.
+        fields = {
+            'date_time': format_timestamp(msg_data.date_time),
+            'name': msg_data.weewx_name,
+            'label': msg_data.label,
+            'threshold_value': msg_data.threshold_value,
+            'current_value': msg_data.current_value,
+            'notifications_sent': msg_data.notifications_sent,
         }
-
-        if msg_data.threshold_type == 'missing' and msg_data.type == 'outside':
-            return msg_missing_template[msg_data.type].format(name=msg_data.weewx_name,
-                                                              label=msg_data.label,
-                                                              date_time=format_timestamp(msg_data.date_time),
-                                                              notifications_sent=msg_data.notifications_sent)
-
-        if msg_data.threshold_type == 'missing' and msg_data.type == 'within':
-            return msg_missing_template[msg_data.type].format(name=msg_data.weewx_name,
-                                                              label=msg_data.label,
-                                                              date_time=format_timestamp(msg_data.date_time),
-                                                              current_value=msg_data.current_value,
-                                                              notifications_sent=msg_data.notifications_sent)
-
-        return msg_template[msg_data.threshold_type][msg_data.type].format(date_time=format_timestamp(msg_data.date_time),
-                                                                           name=msg_data.weewx_name,
-                                                                           label=msg_data.label,
-                                                                           threshold_value=msg_data.threshold_value,
-                                                                           current_value=msg_data.current_value,
-                                                                           notifications_sent=msg_data.notifications_sent
-                                                                           )
+        return MSG_FORMATTER[(msg_data.threshold_type, msg_data.type)](fields)
 
     async def send_notification(self, _msg_data):
         ''' Send the notification.'''
@@ -383,6 +415,10 @@ class AbstractNotifier():
         ''' Perform any final processing for this 'round'. '''
         return
 
+    def close(self):
+        ''' Release any resources held between notifications. '''
+        return
+
 def main():  # pragma no cover
     """ The main routine. """
     print("ERROR: Running this extension from the command line is not supported.")
@@ -17,6 +17,7 @@ Send a notification via pushover, pushover.net
         extension = user.pushover.Pushover
 
         # The number of seconds to wait for the notification to be sent and processed.
+        # This is also the timeout of the connection to the server, which defaults to 10 seconds.
         # Default is None
         timeout = None
 
@@ -102,15 +103,14 @@ Send a notification via pushover, pushover.net
 
 import http.client
 import json
+import select
+import socket
 import time
 import urllib
 
 from weeutil.weeutil import to_bool, to_int
 import user.notify
-
-def format_timestamp(ts, format_str="%Y-%m-%d %H:%M:%S %Z"):
-    ''' Format a timestamp for human consumption. '''
-    return f"{time.strftime(format_str, time.localtime(ts))}"
+from user.notify import format_timestamp
 
 class Pushover(user.notify.AbstractNotifier):
     """ Class to perform the pushover call."""
@@ -124,33 +124,46 @@ class Pushover(user.notify.AbstractNotifier):
         self.server = notifier_dict.get('server', 'api.pushover.net:443')
         self.api = notifier_dict.get('api', '/1/messages.json')
 
+        # The token, user and headers are the same for every request, encode them once.
+        self._body_prefix = urllib.parse.urlencode({"token": self.app_token,
+                                                    "user": self.user_key, })
+        self._headers = {"Content-type": "application/x-www-form-urlencoded"}
+
         self.client_error_log_frequency = to_int(notifier_dict.get('client_error_log_frequency', 3600))
         self.server_error_wait_period = to_int(notifier_dict.get('server_error_wait_period', 3600))
 
         self.client_error_timestamp = 0
         self.server_error_timestamp = 0
 
+        # The connection is created on first use and kept open between notifications.
+        # The socket timeout keeps a silently dropped connection from blocking WeeWX.
+        self.connection_timeout = to_int(notifier_dict.get('timeout', None)) or 10
+        self._connection = None
+
     def _logit(self, title, msg):
         self.logger.loginf(self.name, title)
         self.logger.loginf(self.name, msg)
 
     def throttle_notification(self):
         now = int(time.time())
-        if abs(now - self.client_error_timestamp) < self.client_error_log_frequency:
-            self.logger.logdbg(self.name, (f"Fatal error occurred at {format_timestamp(self.client_error_timestamp)}, "
-                                            f"Notify skipped."))
+        if now - self.client_error_timestamp < self.client_error_log_frequency:
+            if self.logger.is_debug_enabled():
+                self.logger.logdbg(self.name, (f"Fatal error occurred at {format_timestamp(self.client_error_timestamp)}, "
+                                               f"Notify skipped."))
             return True
 
-        if abs(now - self.server_error_timestamp) < self.server_error_wait_period:
-            self.logger.logdbg(self.name, (f"Server error received at {format_timestamp(self.server_error_timestamp)}, "
-                                           f"waiting {self.server_error_wait_period} seconds before retrying."))
+        if now - self.server_error_timestamp < self.server_error_wait_period:
+            if self.logger.is_debug_enabled():
+                self.logger.logdbg(self.name, (f"Server error received at {format_timestamp(self.server_error_timestamp)}, "
+                                               f"waiting {self.server_error_wait_period} seconds before retrying."))
             return True
 
         return False
 
     async def send_notification(self, msg_data):
-        self.logger.logdbg(self.name, f"Message data is '{msg_data}'")
-        self.logger.logdbg(self.name, f"Server is: '{self.server}' for {msg_data.weewx_name}")
+        if self.logger.is_debug_enabled():
+            self.logger.logdbg(self.name, f"Message data is '{msg_data}'")
+            self.logger.logdbg(self.name, f"Server is: '{self.server}' for {msg_data.weewx_name}")
         title = self.build_title(msg_data)
         msg = self.build_message(msg_data)
 
@@ -160,27 +173,74 @@ class Pushover(user.notify.AbstractNotifier):
         if not self.send:
             return True
 
-        connection = http.client.HTTPSConnection(f"{self.server}")
-
-        connection.request("POST",
-                           f"{self.api}",
-                           urllib.parse.urlencode({"token": self.app_token,
-                                                   "user": self.user_key,
-                                                   "message": msg,
-                                                   "title": title, }),
-                           {"Content-type": "application/x-www-form-urlencoded"})
-        response = connection.getresponse()
-
-        return self._check_response(response, msg_data)
+        fields = urllib.parse.urlencode({"message": msg,
+                                         "title": title, })
+        try:
+            response = self._post(f"{self._body_prefix}&{fields}")
+            return self._check_response(response, msg_data)
+        except (http.client.HTTPException, OSError) as exception:
+            # A transport error must not escape into the WeeWX engine, the next notification reconnects.
+            self.close()
+            self.logger.logerr(self.name, f"Unable to send notification for {msg_data.weewx_name}: {exception!r}")
+            return False
+
+    def close(self):
+        ''' Close the connection to the server. '''
+        if self._connection:
+            self._connection.close()
+            self._connection = None
+
+    def _connection_dropped(self):
+        ''' Check if the server has closed the idle connection, an idle socket is only readable at EOF. '''
+        sock = self._connection.sock
+        if sock is None:
+            # Not connected yet, http.client connects when the request is made.
+            return False
+        readable, _, _ = select.select([sock], [], [], 0)
+        return bool(readable)
+
+    def _post(self, body):
+        ''' Post the request, reconnecting once if the kept-alive connection was closed by the server. '''
+        if self._connection is not None and self._connection_dropped():
+            if self.logger.is_debug_enabled():
+                self.logger.logdbg(self.name, f"Idle connection to '{self.server}' was closed, reconnecting.")
+            self.close()
+
+        while True:
+            reused = self._connection is not None
+            if not reused:
+                self._connection = http.client.HTTPSConnection(f"{self.server}", timeout=self.connection_timeout)
+            sent = False
+            try:
+                self._connection.request("POST",
+                                         f"{self.api}",
+                                         body,
+                                         self._headers)
+                sent = True
+                return self._connection.getresponse()
+            except (ConnectionError, socket.timeout) as exception:
+                self.close()
+                # Resending is only safe when the server cannot have processed the request,
+                # it was never sent or the server closed the reused connection without any response.
+                if not reused or (sent and not isinstance(exception, http.client.RemoteDisconnected)):
+                    raise
+                if self.logger.is_debug_enabled():
+                    self.logger.logdbg(self.name, f"Connection to '{self.server}' was closed, reconnecting.")
+            except Exception:
+                self.close()
+                raise
 
     def _check_response(self, response, msg_data):
         ''' Check the response. '''
         now = time.time()
-        self.logger.logdbg(self.name, f"Response code is: '{response.code}' for {msg_data.weewx_name}")
+        if self.logger.is_debug_enabled():
+            self.logger.logdbg(self.name, f"Response code is: '{response.code}' for {msg_data.weewx_name}")
 
         self.server_error_timestamp = 0
         self.client_error_timestamp = 0
         if response.code == 200:
+            # The body has to be read before the connection can be reused.
+            response.read()
             return True
 
         self.logger.logerr(self.name, f"Received code '{response.code}' for {msg_data.weewx_name}")
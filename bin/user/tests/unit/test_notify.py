@@ -8,6 +8,7 @@
 # pylint: disable=missing-module-docstring, missing-function-docstring, missing-class-docstring
 # pylint: disable=protected-access
 
+import asyncio
 import unittest
 import mock
 
@@ -21,7 +22,7 @@ from collections import namedtuple
 from user.notify import Notify, Logger
 
 def random_string(length=32):
-    return ''.join([random.choice(string.ascii_letters + string.digits) for n in range(length)])
+    return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
 
 def setup_config_dict(binding,
                       observation,
@@ -70,7 +71,7 @@ class MockClass():
     def timeout(self):
         return random.randint(1, 100)
 
-    def initialize(self):
+    async def initialize(self):
         pass
 
     def send_notification(self, _arg1):
@@ -79,10 +80,11 @@ class MockClass():
     async def finalize(self):
         pass
 
+    def close(self):
+        pass
+
 class TestNotify(unittest.TestCase):
     def test_init_observations_with_defaults(self):
-        mock_engine = mock.Mock()
-
         binding_type = random_string()
         observation = random_string()
         threshold_type = random.choice(['min', 'max', 'equal'])
@@ -112,10 +114,11 @@ class TestNotify(unittest.TestCase):
                 'last_sent_timestamp': 0,
                 'counter': 0,
             },
+            'threshold_types': [threshold_type],
         }
 
         with mock.patch('user.notify.Logger', spec=Logger):
-            SUT = Notify(mock_engine, config)
+            SUT = Notify(mock.Mock(), config)
 
             observations = SUT.init_observations(config['Notify'][binding_type][observation],
                                                  observation,
@@ -126,8 +129,6 @@ class TestNotify(unittest.TestCase):
             self.assertDictEqual(observations, expected_observations)
 
     def test_init_observations_threshold_type_equals_missing(self):
-        mock_engine = mock.Mock()
-
         binding_type = random_string()
         observation = random_string()
         threshold_type = 'missing'
@@ -154,10 +155,11 @@ class TestNotify(unittest.TestCase):
                 'last_sent_timestamp': 0,
                 'counter': 0,
             },
+            'threshold_types': [threshold_type],
         }
 
         with mock.patch('user.notify.Logger', spec=Logger):
-            SUT = Notify(mock_engine, config)
+            SUT = Notify(mock.Mock(), config)
 
             observations = SUT.init_observations(config['Notify'][binding_type][observation],
                                                  observation,
@@ -167,10 +169,52 @@ class TestNotify(unittest.TestCase):
 
             self.assertDictEqual(observations, expected_observations)
 
+    def test_shutdown_cancels_outstanding_tasks(self):
+        binding_type = random.choice(['archive', 'loop'])
+        observation = random_string()
+        threshold_type = random.choice(['min', 'max', 'equal'])
+
+        config_dict = setup_config_dict(binding_type, observation, threshold_type, value=random.randint(1, 99))
+        config = configobj.ConfigObj(config_dict)
+
+        with mock.patch('user.notify.Logger', spec=Logger):
+            with mock.patch('user.notify.weeutil.weeutil') as mock_weeutil:
+                mock_weeutil.get_object.return_value = MockClass
+
+                SUT = Notify(mock.Mock(), config)
+
+                SUT._run(asyncio.sleep(0))
+                loop = SUT.loop
+                task = loop.create_task(asyncio.sleep(3600))
+
+                SUT.shutDown()
+
+                self.assertTrue(task.cancelled())
+                self.assertTrue(loop.is_closed())
+                self.assertIsNone(SUT.loop)
+
+    def test_shutdown_closes_notifier(self):
+        binding_type = random.choice(['archive', 'loop'])
+        observation = random_string()
+        threshold_type = random.choice(['min', 'max', 'equal'])
+
+        config_dict = setup_config_dict(binding_type, observation, threshold_type, value=random.randint(1, 99))
+        config = configobj.ConfigObj(config_dict)
+
+        with mock.patch('user.notify.Logger', spec=Logger):
+            with mock.patch('user.notify.weeutil.weeutil') as mock_weeutil:
+                mock_weeutil.get_object.return_value = MockClass
+                with mock.patch.object(MockClass, 'close') as mock_close:
+
+                    SUT = Notify(mock.Mock(), config)
+
+                    SUT.shutDown()
+
+                    mock_close.assert_called_once()
+
 # ToDo: change call_count = 1 to called_once_with
 class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
     async def test_process_data_template(self):
-        mock_engine = mock.Mock()
         now = time.time()
 
         threshold_type = random.choice(['missing', 'min', 'max', 'equal'])
@@ -195,14 +239,14 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                             with mock.patch.object(Notify, 'check_within'):
                                 with mock.patch.object(Notify, 'check_outside'):
                                     with mock.patch.object(MockClass, 'timeout', new_callable=mock.Mock):
-                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.Mock):
+                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.AsyncMock):
                                             with mock.patch.object(MockClass, 'send_notification', new_callable=mock.Mock):
                                                 with mock.patch.object(MockClass, 'finalize', new_callable=mock.AsyncMock):
                                                     mock_time.time.return_value = now
                                                     mock_wait.return_value = ([mock.Mock()], [mock.Mock()])
                                                     mock_weeutil.get_object.return_value = MockClass
 
-                                                    SUT = Notify(mock_engine, config)
+                                                    SUT = Notify(mock.Mock(), config)
                                                     if binding_type == 'archive':
                                                         observations = SUT.archive_observations
                                                     if binding_type == 'loop':
@@ -210,8 +254,94 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
 
                                                     await SUT._process_data(False, data, observations)
 
+    async def test_process_data_nothing_to_send(self):
+        now = time.time()
+
+        threshold_type = random.choice(['min', 'max', 'equal'])
+        observation = random_string()
+        threshold_value = random.randint(1, 99)
+        label = random_string()
+
+        data = {
+            observation: threshold_value,
+        }
+        binding_type = random.choice(['archive', 'loop'])
+
+        config_dict = setup_config_dict(binding_type, observation, threshold_type, label, value=threshold_value)
+        config = configobj.ConfigObj(config_dict)
+
+        observations = None
+
+        with mock.patch('user.notify.time') as mock_time:
+            with mock.patch('asyncio.create_task') as mock_create_task:
+                with mock.patch('asyncio.wait') as mock_wait:
+                    with mock.patch('user.notify.Logger', spec=Logger):
+                        with mock.patch('user.notify.weeutil.weeutil') as mock_weeutil:
+                            with mock.patch.object(Notify, 'check_within') as mock_check_within:
+                                with mock.patch.object(Notify, 'check_outside') as mock_check_outside:
+                                    with mock.patch.object(MockClass, 'initialize', new_callable=mock.AsyncMock):
+                                        with mock.patch.object(MockClass, 'send_notification', new_callable=mock.AsyncMock):
+                                            with mock.patch.object(MockClass, 'finalize', new_callable=mock.AsyncMock):
+                                                mock_time.time.return_value = now
+                                                mock_weeutil.get_object.return_value = MockClass
+                                                mock_check_within.return_value = None
+                                                mock_check_outside.return_value = None
+
+                                                SUT = Notify(mock.Mock(), config)
+                                                if binding_type == 'archive':
+                                                    observations = SUT.archive_observations
+                                                if binding_type == 'loop':
+                                                    observations = SUT.loop_observations
+
+                                                await SUT._process_data(False, data, observations)
+
+                                                self.assertEqual(mock_check_within.call_count, 1)
+                                                MockClass.initialize.assert_not_awaited()
+                                                MockClass.send_notification.assert_not_awaited()
+                                                MockClass.finalize.assert_not_awaited()
+                                                self.assertEqual(mock_create_task.call_count, 0)
+                                                self.assertEqual(mock_wait.call_count, 0)
+
+    async def test_process_data_send_fails(self):
+        threshold_type = random.choice(['min', 'max', 'equal'])
+        observation = random_string()
+        threshold_value = random.randint(1, 99)
+        label = random_string()
+
+        data = {
+            observation: threshold_value,
+        }
+        binding_type = random.choice(['archive', 'loop'])
+
+        config_dict = setup_config_dict(binding_type, observation, threshold_type, label, value=threshold_value)
+        config = configobj.ConfigObj(config_dict)
+
+        observations = None
+
+        with mock.patch('user.notify.Logger', spec=Logger):
+            with mock.patch('user.notify.weeutil.weeutil') as mock_weeutil:
+                with mock.patch.object(Notify, 'check_within') as mock_check_within:
+                    with mock.patch.object(MockClass, 'initialize', new_callable=mock.AsyncMock):
+                        with mock.patch.object(MockClass, 'send_notification', new_callable=mock.AsyncMock):
+                            with mock.patch.object(MockClass, 'finalize', new_callable=mock.AsyncMock):
+                                mock_weeutil.get_object.return_value = MockClass
+                                mock_check_within.return_value = 'foo'
+                                MockClass.send_notification.side_effect = ConnectionResetError()
+
+                                SUT = Notify(mock.Mock(), config)
+                                if binding_type == 'archive':
+                                    observations = SUT.archive_observations
+                                if binding_type == 'loop':
+                                    observations = SUT.loop_observations
+
+                                await SUT._process_data(False, data, observations)
+
+                                MockClass.send_notification.assert_awaited_once()
+                                MockClass.finalize.assert_awaited_once()
+                                self.assertEqual(SUT.logger.logerr.call_count, 1)
+                                self.assertEqual(observations[observation][threshold_type]['last_sent_timestamp'], 0)
+
     async def test_process_data_min_within(self):
-        mock_engine = mock.Mock()
         now = time.time()
 
         threshold_type = 'min'
@@ -238,7 +368,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                             with mock.patch.object(Notify, 'check_within') as mock_check_within:
                                 with mock.patch.object(Notify, 'check_outside') as mock_check_outside:
                                     with mock.patch.object(MockClass, 'timeout', new_callable=mock.Mock):
-                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.Mock):
+                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.AsyncMock):
                                             with mock.patch.object(MockClass, 'send_notification', new_callable=mock.Mock):
                                                 with mock.patch.object(MockClass, 'finalize', new_callable=mock.AsyncMock):
                                                     mock_time.time.return_value = now
@@ -246,7 +376,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     mock_weeutil.get_object.return_value = MockClass
                                                     mock_check_outside.return_value = None
 
-                                                    SUT = Notify(mock_engine, config)
+                                                    SUT = Notify(mock.Mock(), config)
                                                     if binding_type == 'archive':
                                                         observations = SUT.archive_observations
                                                     if binding_type == 'loop':
@@ -260,7 +390,6 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     self.assertEqual(mock_wait.call_count, 1)
 
     async def test_process_data_min_outside(self):
-        mock_engine = mock.Mock()
         now = time.time()
 
         threshold_type = 'min'
@@ -287,7 +416,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                             with mock.patch.object(Notify, 'check_within') as mock_check_within:
                                 with mock.patch.object(Notify, 'check_outside') as mock_check_outside:
                                     with mock.patch.object(MockClass, 'timeout', new_callable=mock.Mock):
-                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.Mock):
+                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.AsyncMock):
                                             with mock.patch.object(MockClass, 'send_notification', new_callable=mock.Mock):
                                                 with mock.patch.object(MockClass, 'finalize', new_callable=mock.AsyncMock):
                                                     mock_time.time.return_value = now
@@ -295,7 +424,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     mock_weeutil.get_object.return_value = MockClass
                                                     mock_check_outside.return_value = None
 
-                                                    SUT = Notify(mock_engine, config)
+                                                    SUT = Notify(mock.Mock(), config)
                                                     if binding_type == 'archive':
                                                         observations = SUT.archive_observations
                                                     if binding_type == 'loop':
@@ -309,7 +438,6 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     self.assertEqual(mock_wait.call_count, 0)
 
     async def test_process_data_max_within(self):
-        mock_engine = mock.Mock()
         now = time.time()
 
         threshold_type = 'max'
@@ -336,7 +464,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                             with mock.patch.object(Notify, 'check_within') as mock_check_within:
                                 with mock.patch.object(Notify, 'check_outside') as mock_check_outside:
                                     with mock.patch.object(MockClass, 'timeout', new_callable=mock.Mock):
-                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.Mock):
+                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.AsyncMock):
                                             with mock.patch.object(MockClass, 'send_notification', new_callable=mock.Mock):
                                                 with mock.patch.object(MockClass, 'finalize', new_callable=mock.AsyncMock):
                                                     mock_time.time.return_value = now
@@ -344,7 +472,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     mock_weeutil.get_object.return_value = MockClass
                                                     mock_check_outside.return_value = None
 
-                                                    SUT = Notify(mock_engine, config)
+                                                    SUT = Notify(mock.Mock(), config)
                                                     if binding_type == 'archive':
                                                         observations = SUT.archive_observations
                                                     if binding_type == 'loop':
@@ -358,7 +486,6 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     self.assertEqual(mock_wait.call_count, 1)
 
     async def test_process_data_max_outside(self):
-        mock_engine = mock.Mock()
         now = time.time()
 
         threshold_type = 'max'
@@ -385,7 +512,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                             with mock.patch.object(Notify, 'check_within') as mock_check_within:
                                 with mock.patch.object(Notify, 'check_outside') as mock_check_outside:
                                     with mock.patch.object(MockClass, 'timeout', new_callable=mock.Mock):
-                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.Mock):
+                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.AsyncMock):
                                             with mock.patch.object(MockClass, 'send_notification', new_callable=mock.Mock):
                                                 with mock.patch.object(MockClass, 'finalize', new_callable=mock.AsyncMock):
                                                     mock_time.time.return_value = now
@@ -393,7 +520,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     mock_weeutil.get_object.return_value = MockClass
                                                     mock_check_outside.return_value = None
 
-                                                    SUT = Notify(mock_engine, config)
+                                                    SUT = Notify(mock.Mock(), config)
                                                     if binding_type == 'archive':
                                                         observations = SUT.archive_observations
                                                     if binding_type == 'loop':
@@ -407,7 +534,6 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     self.assertEqual(mock_wait.call_count, 0)
 
     async def test_process_data_equal_within(self):
-        mock_engine = mock.Mock()
         now = time.time()
 
         threshold_type = 'equal'
@@ -434,7 +560,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                             with mock.patch.object(Notify, 'check_within') as mock_check_within:
                                 with mock.patch.object(Notify, 'check_outside') as mock_check_outside:
                                     with mock.patch.object(MockClass, 'timeout', new_callable=mock.Mock):
-                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.Mock):
+                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.AsyncMock):
                                             with mock.patch.object(MockClass, 'send_notification', new_callable=mock.Mock):
                                                 with mock.patch.object(MockClass, 'finalize', new_callable=mock.AsyncMock):
                                                     mock_time.time.return_value = now
@@ -442,7 +568,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     mock_weeutil.get_object.return_value = MockClass
                                                     mock_check_outside.return_value = None
 
-                                                    SUT = Notify(mock_engine, config)
+                                                    SUT = Notify(mock.Mock(), config)
                                                     if binding_type == 'archive':
                                                         observations = SUT.archive_observations
                                                     if binding_type == 'loop':
@@ -456,7 +582,6 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     self.assertEqual(mock_wait.call_count, 1)
 
     async def test_process_data_equal_outside(self):
-        mock_engine = mock.Mock()
         now = time.time()
 
         threshold_type = 'equal'
@@ -483,7 +608,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                             with mock.patch.object(Notify, 'check_within') as mock_check_within:
                                 with mock.patch.object(Notify, 'check_outside') as mock_check_outside:
                                     with mock.patch.object(MockClass, 'timeout', new_callable=mock.Mock):
-                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.Mock):
+                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.AsyncMock):
                                             with mock.patch.object(MockClass, 'send_notification', new_callable=mock.Mock):
                                                 with mock.patch.object(MockClass, 'finalize', new_callable=mock.AsyncMock):
                                                     mock_time.time.return_value = now
@@ -491,7 +616,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     mock_weeutil.get_object.return_value = MockClass
                                                     mock_check_outside.return_value = None
 
-                                                    SUT = Notify(mock_engine, config)
+                                                    SUT = Notify(mock.Mock(), config)
                                                     if binding_type == 'archive':
                                                         observations = SUT.archive_observations
                                                     if binding_type == 'loop':
@@ -505,7 +630,6 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     self.assertEqual(mock_wait.call_count, 0)
 
     async def test_process_data_observation_returns(self):
-        mock_engine = mock.Mock()
         now = time.time()
 
         threshold_type = 'missing'
@@ -532,7 +656,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                             with mock.patch.object(Notify, 'check_within') as mock_check_within:
                                 with mock.patch.object(Notify, 'check_outside') as mock_check_outside:
                                     with mock.patch.object(MockClass, 'timeout', new_callable=mock.Mock):
-                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.Mock):
+                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.AsyncMock):
                                             with mock.patch.object(MockClass, 'send_notification', new_callable=mock.Mock):
                                                 with mock.patch.object(MockClass, 'finalize', new_callable=mock.AsyncMock):
                                                     mock_time.time.return_value = now
@@ -540,7 +664,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     mock_weeutil.get_object.return_value = MockClass
                                                     mock_check_outside.return_value = None
 
-                                                    SUT = Notify(mock_engine, config)
+                                                    SUT = Notify(mock.Mock(), config)
                                                     if binding_type == 'archive':
                                                         observations = SUT.archive_observations
                                                     if binding_type == 'loop':
@@ -554,7 +678,6 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     self.assertEqual(mock_wait.call_count, 1)
 
     async def test_process_data_observation_gone_missing(self):
-        mock_engine = mock.Mock()
         now = time.time()
 
         threshold_type = 'missing'
@@ -581,7 +704,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                             with mock.patch.object(Notify, 'check_within') as mock_check_within:
                                 with mock.patch.object(Notify, 'check_outside') as mock_check_outside:
                                     with mock.patch.object(MockClass, 'timeout', new_callable=mock.Mock):
-                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.Mock):
+                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.AsyncMock):
                                             with mock.patch.object(MockClass, 'send_notification', new_callable=mock.Mock):
                                                 with mock.patch.object(MockClass, 'finalize', new_callable=mock.AsyncMock):
                                                     mock_time.time.return_value = now
@@ -589,7 +712,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     mock_weeutil.get_object.return_value = MockClass
                                                     mock_check_outside.return_value = None
 
-                                                    SUT = Notify(mock_engine, config)
+                                                    SUT = Notify(mock.Mock(), config)
                                                     if binding_type == 'archive':
                                                         observations = SUT.archive_observations
                                                     if binding_type == 'loop':
@@ -603,7 +726,6 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     self.assertEqual(mock_wait.call_count, 0)
 
     async def test_process_data_observation_gone_missing_succeeds(self):
-        mock_engine = mock.Mock()
         now = time.time()
 
         threshold_type = 'missing'
@@ -630,7 +752,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                             with mock.patch.object(Notify, 'check_within') as mock_check_within:
                                 with mock.patch.object(Notify, 'check_outside') as mock_check_outside:
                                     with mock.patch.object(MockClass, 'timeout', new_callable=mock.Mock):
-                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.Mock):
+                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.AsyncMock):
                                             with mock.patch.object(MockClass, 'send_notification', new_callable=mock.Mock):
                                                 with mock.patch.object(MockClass, 'finalize', new_callable=mock.AsyncMock):
                                                     mock_time.time.return_value = now
@@ -638,7 +760,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     mock_weeutil.get_object.return_value = MockClass
                                                     mock_check_outside.return_value = 'foo'
 
-                                                    SUT = Notify(mock_engine, config)
+                                                    SUT = Notify(mock.Mock(), config)
                                                     if binding_type == 'archive':
                                                         observations = SUT.archive_observations
                                                     if binding_type == 'loop':
@@ -652,7 +774,6 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     self.assertEqual(mock_wait.call_count, 1)
 
     async def test_process_data_within_succeeds(self):
-        mock_engine = mock.Mock()
         now = time.time()
 
         threshold_type = random.choice(['min', 'max', 'equal'])
@@ -684,7 +805,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                             with mock.patch.object(Notify, 'check_within') as mock_check_within:
                                 with mock.patch.object(Notify, 'check_outside') as mock_check_outside:
                                     with mock.patch.object(MockClass, 'timeout', new_callable=mock.Mock):
-                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.Mock):
+                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.AsyncMock):
                                             with mock.patch.object(MockClass, 'send_notification', new_callable=mock.Mock):
                                                 with mock.patch.object(MockClass, 'finalize', new_callable=mock.AsyncMock):
                                                     mock_time.time.return_value = now
@@ -692,7 +813,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     mock_weeutil.get_object.return_value = MockClass
                                                     mock_check_outside.return_value = 'foo'
 
-                                                    SUT = Notify(mock_engine, config)
+                                                    SUT = Notify(mock.Mock(), config)
                                                     if binding_type == 'archive':
                                                         observations = SUT.archive_observations
                                                     if binding_type == 'loop':
@@ -706,7 +827,6 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     self.assertEqual(mock_wait.call_count, 1)
 
     async def test_process_data_outside_succeeds(self):
-        mock_engine = mock.Mock()
         now = time.time()
 
         threshold_type = random.choice(['min', 'max', 'equal'])
@@ -736,7 +856,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                             with mock.patch.object(Notify, 'check_within') as mock_check_within:
                                 with mock.patch.object(Notify, 'check_outside') as mock_check_outside:
                                     with mock.patch.object(MockClass, 'timeout', new_callable=mock.Mock):
-                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.Mock):
+                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.AsyncMock):
                                             with mock.patch.object(MockClass, 'send_notification', new_callable=mock.Mock):
                                                 with mock.patch.object(MockClass, 'finalize', new_callable=mock.AsyncMock):
                                                     mock_time.time.return_value = now
@@ -744,7 +864,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     mock_weeutil.get_object.return_value = MockClass
                                                     mock_check_outside.return_value = 'foo'
 
-                                                    SUT = Notify(mock_engine, config)
+                                                    SUT = Notify(mock.Mock(), config)
                                                     if binding_type == 'archive':
                                                         observations = SUT.archive_observations
                                                     if binding_type == 'loop':
@@ -755,10 +875,11 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     self.assertEqual(mock_check_within.call_count, 0)
                                                     self.assertEqual(mock_check_outside.call_count, 1)
                                                     self.assertEqual(mock_create_task.call_count, 1)
+                                                    self.assertEqual(mock_create_task.call_args.kwargs['name'],
+                                                                     f"{observation}-{threshold_type}-{int(now)}")
                                                     self.assertEqual(mock_wait.call_count, 1)
 
     async def test_process_data_observation_is_none(self):
-        mock_engine = mock.Mock()
         now = time.time()
 
         threshold_type = random.choice(['missing', 'min', 'max', 'equal'])
@@ -783,14 +904,14 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                             with mock.patch.object(Notify, 'check_within') as mock_check_within:
                                 with mock.patch.object(Notify, 'check_outside') as mock_check_outside:
                                     with mock.patch.object(MockClass, 'timeout', new_callable=mock.Mock):
-                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.Mock):
+                                        with mock.patch.object(MockClass, 'initialize', new_callable=mock.AsyncMock):
                                             with mock.patch.object(MockClass, 'send_notification', new_callable=mock.Mock):
                                                 with mock.patch.object(MockClass, 'finalize', new_callable=mock.AsyncMock):
                                                     mock_time.time.return_value = now
                                                     mock_wait.return_value = ([mock.Mock()], [mock.Mock()])
                                                     mock_weeutil.get_object.return_value = MockClass
 
-                                                    SUT = Notify(mock_engine, config)
+                                                    SUT = Notify(mock.Mock(), config)
                                                     if binding_type == 'archive':
                                                         observations = SUT.archive_observations
                                                     if binding_type == 'loop':
@@ -803,7 +924,6 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                     self.assertEqual(mock_wait.call_count, 0)
 
     async def test_check_within_threshold_did_not_leave(self):
-        mock_engine = mock.Mock()
         now = time.time()
         threshold_type = random.choice(['missing', 'min', 'max', 'equal'])
         observation = random_string()
@@ -822,7 +942,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                     mock_time.time.return_value = now
                     mock_weeutil.get_object.return_value = MockClass
 
-                    SUT = Notify(mock_engine, config)
+                    SUT = Notify(mock.Mock(), config)
 
                     if binding_type == 'archive':
                         SUT.archive_observations[observation][threshold_type]['counter'] = 0
@@ -849,7 +969,6 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                     self.assertIsNone(result)
 
     async def test_check_within_threshold_no_notifications_sent(self):
-        mock_engine = mock.Mock()
         now = time.time()
         threshold_type = random.choice(['missing', 'min', 'max', 'equal'])
         observation = random_string()
@@ -868,7 +987,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                     mock_time.time.return_value = now
                     mock_weeutil.get_object.return_value = MockClass
 
-                    SUT = Notify(mock_engine, config)
+                    SUT = Notify(mock.Mock(), config)
 
                     if binding_type == 'archive':
                         SUT.archive_observations[observation][threshold_type]['counter'] = \
@@ -897,7 +1016,6 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                     self.assertIsNone(result)
 
     async def test_check_within_threshold_return_notification_not_configured(self):
-        mock_engine = mock.Mock()
         now = time.time()
         threshold_type = random.choice(['missing', 'min', 'max', 'equal'])
         observation = random_string()
@@ -916,7 +1034,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                     mock_time.time.return_value = now
                     mock_weeutil.get_object.return_value = MockClass
 
-                    SUT = Notify(mock_engine, config)
+                    SUT = Notify(mock.Mock(), config)
 
                     if binding_type == 'archive':
                         SUT.archive_observations[observation][threshold_type]['counter'] = \
@@ -945,7 +1063,6 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                     self.assertIsNone(result)
 
     async def test_check_within_threshold_notification_sent(self):
-        mock_engine = mock.Mock()
         now = time.time()
         threshold_type = random.choice(['missing', 'min', 'max', 'equal'])
         observation = random_string()
@@ -979,7 +1096,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                     mock_time.time.return_value = now
                     mock_weeutil.get_object.return_value = MockClass
 
-                    SUT = Notify(mock_engine, config)
+                    SUT = Notify(mock.Mock(), config)
 
                     if binding_type == 'archive':
                         SUT.archive_observations[observation][threshold_type]['counter'] = \
@@ -1008,7 +1125,6 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                     self.assertEqual(result, expected_result)
 
     async def test_check_outside_threshold_on_first_leaving(self):
-        mock_engine = mock.Mock()
         now = time.time()
         first_check = False
         threshold_type = random.choice(['missing', 'min', 'max', 'equal'])
@@ -1032,7 +1148,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                     mock_time.time.return_value = now
                     mock_weeutil.get_object.return_value = MockClass
 
-                    SUT = Notify(mock_engine, config)
+                    SUT = Notify(mock.Mock(), config)
 
                     if binding_type == 'archive':
                         SUT.archive_observations[observation][threshold_type]['counter'] = 0
@@ -1041,7 +1157,8 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                    observation,
                                                    label,
                                                    SUT.archive_observations[observation][threshold_type],
-                                                   value)
+                                                   value,
+                                                   int(now))
 
                     if binding_type == 'loop':
                         SUT.loop_observations[observation][threshold_type]['counter'] = 0
@@ -1050,7 +1167,8 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                    observation,
                                                    label,
                                                    SUT.loop_observations[observation][threshold_type],
-                                                   value)
+                                                   value,
+                                                   int(now))
 
                     self.assertIsNone(result)
                     if binding_type == 'archive':
@@ -1059,7 +1177,6 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                         self.assertDictEqual(SUT.loop_observations[observation][threshold_type]['threshold_passed'], expected_dict)
 
     async def test_check_outside_threshold_wait_time_not_met(self):
-        mock_engine = mock.Mock()
         now = 0
         first_check = False
         threshold_type = random.choice(['missing', 'min', 'max', 'equal'])
@@ -1079,7 +1196,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                     mock_time.time.return_value = now
                     mock_weeutil.get_object.return_value = MockClass
 
-                    SUT = Notify(mock_engine, config)
+                    SUT = Notify(mock.Mock(), config)
 
                     if binding_type == 'archive':
                         SUT.archive_observations[observation][threshold_type]['counter'] = \
@@ -1089,7 +1206,8 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                    observation,
                                                    label,
                                                    SUT.archive_observations[observation][threshold_type],
-                                                   value)
+                                                   value,
+                                                   int(now))
 
                     if binding_type == 'loop':
                         SUT.loop_observations[observation][threshold_type]['counter'] = \
@@ -1099,12 +1217,12 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                    observation,
                                                    label,
                                                    SUT.loop_observations[observation][threshold_type],
-                                                   value)
+                                                   value,
+                                                   int(now))
 
                     self.assertIsNone(result)
 
     async def test_check_outside_threshold_first_time_checking(self):
-        mock_engine = mock.Mock()
         now = time.time()
         first_check = True
         threshold_type = random.choice(['missing', 'min', 'max', 'equal'])
@@ -1144,7 +1262,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                     mock_time.time.return_value = now
                     mock_weeutil.get_object.return_value = MockClass
 
-                    SUT = Notify(mock_engine, config)
+                    SUT = Notify(mock.Mock(), config)
 
                     if binding_type == 'archive':
                         SUT.archive_observations[observation][threshold_type]['counter'] = \
@@ -1157,7 +1275,8 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                    observation,
                                                    label,
                                                    SUT.archive_observations[observation][threshold_type],
-                                                   value)
+                                                   value,
+                                                   int(now))
 
                     if binding_type == 'loop':
                         SUT.loop_observations[observation][threshold_type]['counter'] = \
@@ -1170,12 +1289,12 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                    observation,
                                                    label,
                                                    SUT.loop_observations[observation][threshold_type],
-                                                   value)
+                                                   value,
+                                                   int(now))
 
                     self.assertEqual(result, expected_result)
 
     async def test_check_outside_threshold_count_not_met(self):
-        mock_engine = mock.Mock()
         now = time.time()
         first_check = False
         threshold_type = random.choice(['missing', 'min', 'max', 'equal'])
@@ -1195,7 +1314,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                     mock_time.time.return_value = now
                     mock_weeutil.get_object.return_value = MockClass
 
-                    SUT = Notify(mock_engine, config)
+                    SUT = Notify(mock.Mock(), config)
 
                     if binding_type == 'archive':
                         SUT.archive_observations[observation][threshold_type]['counter'] = \
@@ -1205,7 +1324,8 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                    observation,
                                                    label,
                                                    SUT.archive_observations[observation][threshold_type],
-                                                   value)
+                                                   value,
+                                                   int(now))
 
                     if binding_type == 'loop':
                         SUT.loop_observations[observation][threshold_type]['counter'] = \
@@ -1215,12 +1335,12 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                    observation,
                                                    label,
                                                    SUT.loop_observations[observation][threshold_type],
-                                                   value)
+                                                   value,
+                                                   int(now))
 
                     self.assertIsNone(result)
 
     async def test_check_outside_threshold(self):
-        mock_engine = mock.Mock()
         now = time.time()
         first_check = False
         threshold_type = random.choice(['missing', 'min', 'max', 'equal'])
@@ -1256,7 +1376,7 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                     mock_time.time.return_value = now
                     mock_weeutil.get_object.return_value = MockClass
 
-                    SUT = Notify(mock_engine, config)
+                    SUT = Notify(mock.Mock(), config)
 
                     if binding_type == 'archive':
                         SUT.archive_observations[observation][threshold_type]['counter'] = \
@@ -1269,7 +1389,8 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                    observation,
                                                    label,
                                                    SUT.archive_observations[observation][threshold_type],
-                                                   value)
+                                                   value,
+                                                   int(now))
 
                     if binding_type == 'loop':
                         SUT.loop_observations[observation][threshold_type]['counter'] = \
@@ -1282,25 +1403,10 @@ class TestAsyncNotify(unittest.IsolatedAsyncioTestCase):
                                                    observation,
                                                    label,
                                                    SUT.loop_observations[observation][threshold_type],
-                                                   value)
+                                                   value,
+                                                   int(now))
 
                     self.assertEqual(result, expected_result)
 
 if __name__ == '__main__':
-    test_suite = unittest.TestSuite()
-    # test_suite.addTest(TestNotify('test_process_data_observation_is_none'))
-    # test_suite.addTest(TestNotify('test_process_data_outside_succeeds'))
-    # test_suite.addTest(TestNotify('test_process_data_within_succeeds'))
-    # test_suite.addTest(TestNotify('test_process_data_observation_gone_missing_succeeds'))
-    # test_suite.addTest(TestNotify('test_process_data_observation_gone_missing'))
-    # test_suite.addTest(TestNotify('test_process_data_observation_returns'))
-    # test_suite.addTest(TestNotify('test_process_data_equal_outside'))
-    # test_suite.addTest(TestNotify('test_process_data_equal_within'))
-    # test_suite.addTest(TestNotify('test_process_data_max_outside'))
-    # test_suite.addTest(TestNotify('test_process_data_max_within'))
-    # test_suite.addTest(TestNotify('test_process_data_min_outside'))
-    # test_suite.addTest(TestNotify('test_process_data_min_within'))
-
-    # unittest.TextTestRunner().run(test_suite)
-
     unittest.main(exit=False)
@@ -13,6 +13,7 @@ import mock
 
 import configobj
 from collections import namedtuple
+import http.client
 import random
 import string
 import time
@@ -21,76 +22,57 @@ from user.notify import Logger
 from user.pushover import Pushover
 
 def random_string(length=32):
-    return ''.join([random.choice(string.ascii_letters + string.digits) for n in range(length)])
+    return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
 
 class TestPushover(unittest.TestCase):
+    def setUp(self):
+        self.mock_logger = mock.Mock(spec=Logger)
+        self.SUT = Pushover(self.mock_logger, configobj.ConfigObj({}))
+
     def test_throttle_notification_no_recent_errors(self):
-        mock_logger = mock.Mock(spec=Logger)
         now = time.time()
 
-        config_dict = {}
-        config = configobj.ConfigObj(config_dict)
-
         with mock.patch('user.pushover.time') as mock_time:
             mock_time.time.return_value = now
 
-            SUT = Pushover(mock_logger, config)
-
-            result = SUT.throttle_notification()
+            result = self.SUT.throttle_notification()
 
             self.assertFalse(result)
 
     def test_throttle_notification_client_error_recent(self):
-        mock_logger = mock.Mock(spec=Logger)
         now = time.time()
 
-        config_dict = {}
-        config = configobj.ConfigObj(config_dict)
-
         with mock.patch('user.pushover.time') as mock_time:
             mock_time.time.return_value = now
 
-            SUT = Pushover(mock_logger, config)
+            self.SUT.client_error_timestamp = now
 
-            SUT.client_error_timestamp = now
-
-            result = SUT.throttle_notification()
+            result = self.SUT.throttle_notification()
 
             # ToDo: change call_count == 1 to called_once_with
             self.assertTrue(result)
-            self.assertEqual(mock_logger.logdbg.call_count, 1)
+            self.assertEqual(self.mock_logger.logdbg.call_count, 1)
 
     def test_throttle_notification_server_error_recent(self):
-        mock_logger = mock.Mock(spec=Logger)
         now = time.time()
 
-        config_dict = {}
-        config = configobj.ConfigObj(config_dict)
-
         with mock.patch('user.pushover.time') as mock_time:
             mock_time.time.return_value = now
 
-            SUT = Pushover(mock_logger, config)
+            self.SUT.server_error_timestamp = now
 
-            SUT.server_error_timestamp = now
-
-            result = SUT.throttle_notification()
+            result = self.SUT.throttle_notification()
 
             # ToDo: change call_count == 1 to called_once_with
             self.assertTrue(result)
-            self.assertEqual(mock_logger.logdbg.call_count, 1)
+            self.assertEqual(self.mock_logger.logdbg.call_count, 1)
 
     def test_check_response_with_success_200(self):
-        mock_logger = mock.Mock(spec=Logger)
-
         mock_response = mock.Mock(name='mock_response')
         mock_response.code = 200
 
         now = time.time()
 
-        config_dict = {}
-        config = configobj.ConfigObj(config_dict)
-
         msg_data_dict = {
             'threshold_type': random_string(),
             'type': random_string(),
@@ -108,26 +90,19 @@ class TestPushover(unittest.TestCase):
                 mock_json.loads.return_value = {'errors': ['Error One', 'Error Two']}
                 mock_time.time.return_value = now
 
-                SUT = Pushover(mock_logger, config)
-
-                result = SUT._check_response(mock_response, msg_data)
+                result = self.SUT._check_response(mock_response, msg_data)
 
                 self.assertTrue(result)
-                self.assertEqual(SUT.client_error_timestamp, 0)
-                self.assertEqual(SUT.server_error_timestamp, 0)
-                self.assertEqual(mock_logger.logerr.call_count, 0)
+                self.assertEqual(self.SUT.client_error_timestamp, 0)
+                self.assertEqual(self.SUT.server_error_timestamp, 0)
+                self.assertEqual(self.mock_logger.logerr.call_count, 0)
 
     def test_check_response_with_error_4xx(self):
-        mock_logger = mock.Mock(spec=Logger)
-
         mock_response = mock.Mock(name='mock_response')
         mock_response.code = random.randint(400, 499)
 
         now = time.time()
 
-        config_dict = {}
-        config = configobj.ConfigObj(config_dict)
-
         msg_data_dict = {
             'threshold_type': random_string(),
             'type': random_string(),
@@ -145,26 +120,19 @@ class TestPushover(unittest.TestCase):
                 mock_json.loads.return_value = {'errors': ['Error One', 'Error Two']}
                 mock_time.time.return_value = now
 
-                SUT = Pushover(mock_logger, config)
-
-                result = SUT._check_response(mock_response, msg_data)
+                result = self.SUT._check_response(mock_response, msg_data)
 
                 self.assertFalse(result)
-                self.assertEqual(SUT.client_error_timestamp, now)
-                self.assertEqual(SUT.server_error_timestamp, 0)
-                self.assertEqual(mock_logger.logerr.call_count, 2)
+                self.assertEqual(self.SUT.client_error_timestamp, now)
+                self.assertEqual(self.SUT.server_error_timestamp, 0)
+                self.assertEqual(self.mock_logger.logerr.call_count, 2)
 
     def test_check_response_with_error_5xx(self):
-        mock_logger = mock.Mock(spec=Logger)
-
         mock_response = mock.Mock(name='mock_response')
         mock_response.code = random.randint(500, 599)
 
         now = time.time()
 
-        config_dict = {}
-        config = configobj.ConfigObj(config_dict)
-
         msg_data_dict = {
             'threshold_type': random_string(),
             'type': random_string(),
@@ -182,16 +150,33 @@ class TestPushover(unittest.TestCase):
                 mock_json.loads.return_value = {'errors': ['Error One', 'Error Two']}
                 mock_time.time.return_value = now
 
-                SUT = Pushover(mock_logger, config)
-
-                result = SUT._check_response(mock_response, msg_data)
+                result = self.SUT._check_response(mock_response, msg_data)
 
                 self.assertFalse(result)
-                self.assertEqual(SUT.client_error_timestamp, 0)
-                self.assertEqual(SUT.server_error_timestamp, now)
-                self.assertEqual(mock_logger.logerr.call_count, 2)
+                self.assertEqual(self.SUT.client_error_timestamp, 0)
+                self.assertEqual(self.SUT.server_error_timestamp, now)
+                self.assertEqual(self.mock_logger.logerr.call_count, 2)
 
 class TestPushoverAsync(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.mock_logger = mock.Mock(spec=Logger)
+        self.SUT = Pushover(self.mock_logger, configobj.ConfigObj({}))
+
+        msg_data_dict = {
+            'threshold_type': 'equal',
+            'type': 'outside',
+            'date_time': 1,
+            'weewx_name': 'foo',
+            'label': 'foo',
+            'threshold_value': 101,
+            'current_value': 102,
+            'notifications_sent': 201,
+        }
+        self.msg_data = namedtuple('MsgData', msg_data_dict.keys())(**msg_data_dict)
+
+        self.mock_response = mock.Mock(name='mock_response')
+        self.mock_response.code = 200
+
     # This is a bit silly test, but it is a good template for testing HTTP Post
     # ToDo: change call_count = 1 to called_once_with
     async def test_error_sending_notification(self):
@@ -232,9 +217,105 @@ class TestPushoverAsync(unittest.IsolatedAsyncioTestCase):
                     self.assertEqual(mock_connection_instance.getresponse.call_count, 1)
                     self.assertEqual(mock_response.read.call_count, 1)
 
-if __name__ == '__main__':
-    # test_suite = unittest.TestSuite()
-    # test_suite.addTest(TestObservationMissing('tests_observation_missing_at_startup'))
-    # unittest.TextTestRunner().run(test_suite)
+    async def test_connection_is_reused(self):
+        with mock.patch('user.pushover.time'):
+            with mock.patch('user.pushover.select') as mock_select:
+                with mock.patch('http.client.HTTPSConnection') as mock_connection:
+                    mock_select.select.return_value = ([], [], [])
+                    mock_connection_instance = mock_connection.return_value
+                    mock_connection_instance.getresponse.return_value = self.mock_response
+
+                    result1 = await self.SUT.send_notification(self.msg_data)
+                    result2 = await self.SUT.send_notification(self.msg_data)
+
+                    self.assertTrue(result1)
+                    self.assertTrue(result2)
+                    self.assertEqual(mock_connection.call_count, 1)
+                    self.assertEqual(mock_connection_instance.request.call_count, 2)
+                    self.assertEqual(self.mock_response.read.call_count, 2)
+
+    async def test_close_closes_connection(self):
+        with mock.patch('user.pushover.time'):
+            with mock.patch('http.client.HTTPSConnection') as mock_connection:
+                mock_connection_instance = mock_connection.return_value
+                mock_connection_instance.getresponse.return_value = self.mock_response
+
+                await self.SUT.send_notification(self.msg_data)
+                self.SUT.close()
+
+                self.assertEqual(mock_connection_instance.close.call_count, 1)
+                self.assertIsNone(self.SUT._connection)
+
+    async def test_reconnect_when_idle_connection_dropped(self):
+        with mock.patch('user.pushover.time'):
+            with mock.patch('user.pushover.select') as mock_select:
+                with mock.patch('http.client.HTTPSConnection') as mock_connection:
+                    mock_connection_instance = mock_connection.return_value
+                    mock_select.select.return_value = ([mock_connection_instance.sock], [], [])
+                    mock_connection_instance.getresponse.return_value = self.mock_response
+
+                    await self.SUT.send_notification(self.msg_data)
+                    result = await self.SUT.send_notification(self.msg_data)
+
+                    self.assertTrue(result)
+                    self.assertEqual(mock_connection.call_count, 2)
+                    self.assertEqual(mock_connection_instance.close.call_count, 1)
+                    self.assertEqual(mock_connection_instance.request.call_count, 2)
+
+    async def test_reconnect_when_connection_closed(self):
+        with mock.patch('user.pushover.time'):
+            with mock.patch('user.pushover.select') as mock_select:
+                with mock.patch('http.client.HTTPSConnection') as mock_connection:
+                    mock_select.select.return_value = ([], [], [])
+                    mock_connection_instance = mock_connection.return_value
+                    mock_connection_instance.request.side_effect = [None, BrokenPipeError(), None]
+                    mock_connection_instance.getresponse.return_value = self.mock_response
+
+                    await self.SUT.send_notification(self.msg_data)
+                    result = await self.SUT.send_notification(self.msg_data)
+
+                    self.assertTrue(result)
+                    mock_connection.assert_called_with('api.pushover.net:443', timeout=10)
+                    self.assertEqual(mock_connection.call_count, 2)
+                    self.assertEqual(mock_connection_instance.close.call_count, 1)
+                    self.assertEqual(mock_connection_instance.request.call_count, 3)
+                    self.assertEqual(mock_connection_instance.getresponse.call_count, 2)
+
+    async def test_reconnect_when_server_closed_without_response(self):
+        with mock.patch('user.pushover.time'):
+            with mock.patch('user.pushover.select') as mock_select:
+                with mock.patch('http.client.HTTPSConnection') as mock_connection:
+                    mock_select.select.return_value = ([], [], [])
+                    mock_connection_instance = mock_connection.return_value
+                    mock_connection_instance.getresponse.side_effect = [self.mock_response,
+                                                                        http.client.RemoteDisconnected(),
+                                                                        self.mock_response]
+
+                    await self.SUT.send_notification(self.msg_data)
+                    result = await self.SUT.send_notification(self.msg_data)
 
+                    self.assertTrue(result)
+                    self.assertEqual(mock_connection.call_count, 2)
+                    self.assertEqual(mock_connection_instance.close.call_count, 1)
+                    self.assertEqual(mock_connection_instance.request.call_count, 3)
+
+    async def test_no_resend_when_response_fails(self):
+        with mock.patch('user.pushover.time'):
+            with mock.patch('user.pushover.select') as mock_select:
+                with mock.patch('http.client.HTTPSConnection') as mock_connection:
+                    mock_select.select.return_value = ([], [], [])
+                    mock_connection_instance = mock_connection.return_value
+                    mock_connection_instance.getresponse.side_effect = [self.mock_response, ConnectionResetError()]
+
+                    await self.SUT.send_notification(self.msg_data)
+                    result = await self.SUT.send_notification(self.msg_data)
+
+                    self.assertFalse(result)
+                    self.assertEqual(mock_connection.call_count, 1)
+                    self.assertEqual(mock_connection_instance.request.call_count, 2)
+                    self.assertEqual(mock_connection_instance.close.call_count, 1)
+                    self.assertEqual(self.mock_logger.logerr.call_count, 1)
+                    self.assertIsNone(self.SUT._connection)
+
+if __name__ == '__main__':
     unittest.main(exit=False)
@@ -135,7 +135,7 @@ class NotifyInstaller(ExtensionInstaller):
             ]
         }
 
-        install_dict['config'] = configobj.ConfigObj(StringIO(EXTENSION_CONFIG))
+        install_dict['config'] = configobj.ConfigObj(StringIO(EXTENSION_CONFIG), interpolation=False)
         install_dict['restful_services'] = 'user.notify.Notify'
 
         super().__init__(install_dict)